@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import dash
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output
@@ -6,7 +8,7 @@ import plotly.graph_objects as go
 import pandas as pd
 
 # Importar procesador de datos
-from data_processor import DataProcessor
+from data_processor import DataProcessor, PVALUE_MIN_N, BOOTSTRAP_MIN_N
 
 # Inicializar app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
@@ -53,6 +55,15 @@ app.layout = html.Div([
                 style={'fontSize': 14}
             )
         ], style={'width': '100%'}),
+        
+        html.Div([
+            dcc.Checklist(
+                id='stats-mode',
+                options=[{'label': ' 🧪 Modo estadístico (p-valor e IC bootstrap 95%)', 'value': 'on'}],
+                value=[],
+                style={'fontSize': 14}
+            )
+        ], style={'width': '100%', 'marginTop': 15}),
     ], style={'backgroundColor': 'white', 'padding': '20px', 'marginBottom': '20px', 'borderRadius': '15px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
     
     # KPIs principales
@@ -107,6 +118,12 @@ app.layout = html.Div([
 ], style={'backgroundColor': colors['background'], 'padding': '20px', 'fontFamily': 'Arial, sans-serif', 'maxWidth': '1400px', 'margin': '0 auto'})
 
 
+@lru_cache(maxsize=None)
+def cached_kpis(selected_day, estadisticas):
+    """KPIs por día y modo estadístico (los datos no cambian entre callbacks)"""
+    return DataProcessor().calculate_kpis(selected_day, estadisticas=estadisticas)
+
+
 # Callbacks
 @app.callback(
     [Output('kpi-cards', 'children'),
@@ -117,14 +134,15 @@ app.layout = html.Div([
      Output('anomalias-table', 'children'),
      Output('detailed-analysis', 'children'),
      Output('recommendations', 'children')],
-    [Input('day-filter', 'value')]
+    [Input('day-filter', 'value'),
+     Input('stats-mode', 'value')]
 )
-def update_dashboard(selected_day):
+def update_dashboard(selected_day, stats_mode):
     # Cargar datos
     processor = DataProcessor()
     
     # KPIs
-    kpis = processor.calculate_kpis(selected_day)
+    kpis = cached_kpis(selected_day, 'on' in (stats_mode or []))
     kpi_cards = create_kpi_cards(kpis)
     
     # Scatter plot
@@ -172,7 +190,10 @@ def create_kpi_cards(kpis):
             html.H4("Correlación", style={'color': colors['text'], 'marginBottom': 10, 'fontSize': 16}),
             html.H2(f"{kpis['correlacion']:.2f}", 
                    style={'color': colors['primary'], 'margin': 0, 'fontSize': '2.5em'}),
-            html.P("Uso vs Productividad", style={'fontSize': 12, 'color': 'gray', 'marginTop': 10})
+            html.P("Uso vs Productividad", style={'fontSize': 12, 'color': 'gray', 'marginTop': 10}),
+            *([html.P(format_significance(kpis['estadisticas']['global']),
+                      style={'fontSize': 12, 'color': colors['text'], 'margin': 0})]
+              if 'estadisticas' in kpis else [])
         ], style={**kpi_style_base, 'width': '23%', 'display': 'inline-block', 'marginRight': '2%'}),
         
         # Promedio uso
@@ -200,10 +221,66 @@ def create_kpi_cards(kpis):
             html.H2(f"{kpis['casos_totales']}", 
                    style={'color': colors['danger'], 'margin': 0, 'fontSize': '2.5em'}),
             html.P("Periodo analizado", style={'fontSize': 12, 'color': 'gray', 'marginTop': 10})
-        ], style={**kpi_style_base, 'width': '23%', 'display': 'inline-block'})
+        ], style={**kpi_style_base, 'width': '23%', 'display': 'inline-block'}),
+        
+        # Significancia por día y por rep (modo estadístico)
+        *([create_stats_cards(kpis['estadisticas'], kpi_style_base)] if 'estadisticas' in kpis else [])
     ])
 
 
+def format_significance(resultado, p_key='p_valor'):
+    """Formatear p-valor e IC bootstrap de una correlación"""
+    if resultado['n'] < PVALUE_MIN_N:
+        return f"n={resultado['n']}: datos insuficientes (n<{PVALUE_MIN_N})"
+    if pd.isna(resultado[p_key]):
+        return f"n={resultado['n']}: sin varianza en uso o productividad"
+    
+    significativa = "✅" if resultado[p_key] < 0.05 else "➖"
+    if pd.isna(resultado['ic_inf']):
+        intervalo = f"IC95% n/d (n<{BOOTSTRAP_MIN_N})"
+    else:
+        intervalo = f"IC95% [{resultado['ic_inf']:.2f}, {resultado['ic_sup']:.2f}]"
+    etiqueta_p = "p Holm" if p_key == 'p_ajustado' else "p"
+    return f"{significativa} {etiqueta_p}={resultado[p_key]:.3f} · {intervalo} · n={resultado['n']}"
+
+
+def create_stats_cards(estadisticas, kpi_style_base):
+    """Crear tarjetas de significancia por día y por representante"""
+    por_dia = [
+        html.Li(f"🗓️ {dia}: r={res['correlacion']:.2f} · {format_significance(res)}",
+                style={'marginBottom': 6})
+        for dia, res in estadisticas['por_dia'].items()
+    ]
+    
+    evaluables = {rep: res for rep, res in estadisticas['por_rep'].items() if not pd.isna(res['p_valor'])}
+    significativos = [rep for rep, res in evaluables.items() if res['p_ajustado'] < 0.05]
+    por_rep = [
+        html.Li(f"👤 {rep}: r={res['correlacion']:.2f} · {format_significance(res, 'p_ajustado')}",
+                style={'marginBottom': 6})
+        for rep, res in sorted(evaluables.items(), key=lambda item: item[1]['p_ajustado'])
+    ]
+    
+    list_style = {'textAlign': 'left', 'fontSize': 13, 'paddingLeft': 20, 'margin': 0}
+    
+    return html.Div([
+        html.Div([
+            html.H4("🧪 Correlación por Día", style={'color': colors['text'], 'marginBottom': 10, 'fontSize': 16}),
+            html.Ul(por_dia, style=list_style)
+        ], style={**kpi_style_base, 'width': '49%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
+        
+        html.Div([
+            html.H4("🧪 Correlación por Representante", style={'color': colors['text'], 'marginBottom': 10, 'fontSize': 16}),
+            html.H2(f"{len(significativos)}/{len(evaluables)}",
+                   style={'color': colors['primary'], 'margin': 0, 'fontSize': '2.5em'}),
+            html.P(f"Reps con correlación significativa (p<0.05 con ajuste de Holm, n≥{PVALUE_MIN_N} días; "
+                   f"IC bootstrap sólo con n≥{BOOTSTRAP_MIN_N})",
+                   style={'fontSize': 12, 'color': 'gray', 'marginTop': 10}),
+            html.Ul(por_rep, style={**list_style, 'maxHeight': '200px', 'overflowY': 'auto'})
+            if por_rep else html.P("Ningún rep evaluable", style={'fontSize': 13, 'color': colors['text'], 'margin': 0})
+        ], style={**kpi_style_base, 'width': '49%', 'display': 'inline-block', 'verticalAlign': 'top'})
+    ], style={'marginTop': '20px'})
+
+
 def create_anomalies_table(anomalias):
     """Crear tabla de anomalías"""
     if anomalias.empty:
@@ -1,9 +1,125 @@
+import warnings
+import zlib
+
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from scipy import stats
 
+# Máximo de elementos por lote de remuestreos bootstrap (acota la memoria)
+BOOTSTRAP_CHUNK_SIZE = 2_000_000
+
+# Tamaños mínimos de muestra para el p-valor (prueba t) y el IC bootstrap
+PVALUE_MIN_N = 3
+BOOTSTRAP_MIN_N = 6
+
+# Varianza relativa por debajo de la cual una variable se considera constante
+DISPERSION_RTOL = 1e-10
+
+
+def _group_rng(seed, group_col, clave):
+    """Generador propio y estable para un grupo (no depende de los demás grupos)"""
+    return np.random.default_rng([seed, zlib.crc32(f"{group_col}:{clave}".encode('utf-8'))])
+
+
+def _holm_adjust(p_valores):
+    """Ajuste de Holm-Bonferroni para comparaciones múltiples (ignora NaN)"""
+    p = np.asarray(p_valores, dtype=float)
+    ajustados = np.full(p.shape, np.nan)
+    validos = np.flatnonzero(~np.isnan(p))
+    if validos.size == 0:
+        return ajustados
+    orden = validos[np.argsort(p[validos])]
+    m = orden.size
+    escalados = np.minimum(1.0, np.maximum.accumulate(p[orden] * (m - np.arange(m))))
+    ajustados[orden] = escalados
+    return ajustados
+
+
+def _weighted_pearson(w, momentos, n):
+    """Correlación de Pearson a partir de pesos por observación
+
+    w (G, B, n_max) son conteos de remuestreo (o la máscara de datos válidos),
+    momentos (G, n_max, 5) trae c_x, c_y, c_x², c_y² y c_x·c_y centrados por
+    grupo, y n (G, 1) el tamaño de cada grupo. Devuelve NaN donde x o y no
+    tienen dispersión: la varianza se compara en forma relativa porque con
+    decimales no representables (p. ej. 3.3) no llega a ser exactamente cero.
+    """
+    sx, sy, sxx, syy, sxy = np.moveaxis(w @ momentos, -1, 0)
+    vx = sxx - sx ** 2 / n
+    vy = syy - sy ** 2 / n
+    sin_dispersion = (vx <= DISPERSION_RTOL * sxx) | (vy <= DISPERSION_RTOL * syy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = (sxy - sx * sy / n) / np.sqrt(vx * vy)
+    return np.where(sin_dispersion, np.nan, np.clip(r, -1.0, 1.0))
+
+
+def _correlation_stats(xs, ys, n_bootstrap, rngs, confianza=0.95):
+    """Correlación, p-valor e IC bootstrap para G grupos de cualquier tamaño
+
+    xs, ys son listas de arreglos 1-D (uno por grupo) y rngs trae un generador
+    por grupo, de modo que el IC de cada grupo depende sólo de sus propios
+    datos. Los grupos se rellenan hasta el mayor n y todos se evalúan en un
+    solo lote: cada remuestreo es un vector de conteos y las sumas salen de
+    un producto matricial (G, B, n) @ (G, n, 5), por lotes para no exceder
+    BOOTSTRAP_CHUNK_SIZE.
+    """
+    g = len(xs)
+    n = np.array([len(x) for x in xs])
+    ancho = n.max()
+    mask = np.arange(ancho) < n[:, None]
+
+    momentos = np.zeros((g, ancho, 5))
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        cx = x - x.mean()
+        cy = y - y.mean()
+        momentos[i, :n[i]] = np.column_stack([cx, cy, cx ** 2, cy ** 2, cx * cy])
+
+    r = _weighted_pearson(mask[:, None, :].astype(float), momentos, n[:, None])[:, 0]
+
+    # p-valor bilateral con la distribución t de Student (n - 2 grados de libertad)
+    p_valor = np.full(g, np.nan)
+    con_p = (n >= PVALUE_MIN_N) & ~np.isnan(r)
+    if con_p.any():
+        gl = n[con_p] - 2
+        t = r[con_p] * np.sqrt(gl / np.maximum(1.0 - r[con_p] ** 2, np.finfo(float).tiny))
+        p_valor[con_p] = 2 * stats.t.sf(np.abs(t), gl)
+
+    ic_inf = np.full(g, np.nan)
+    ic_sup = np.full(g, np.nan)
+    sel = np.flatnonzero(n >= BOOTSTRAP_MIN_N)
+    if sel.size and n_bootstrap > 0:
+        ancho_sel = n[sel].max()
+        momentos_sel = momentos[sel, :ancho_sel]
+        n_sel = n[sel][:, None]
+
+        lote = max(1, BOOTSTRAP_CHUNK_SIZE // (sel.size * ancho_sel))
+        conteos = np.empty((sel.size, min(lote, n_bootstrap), ancho_sel))
+        r_boot = np.empty((sel.size, n_bootstrap))
+        for inicio in range(0, n_bootstrap, lote):
+            b = min(lote, n_bootstrap - inicio)
+            desplazamiento = (np.arange(b) * ancho_sel)[:, None]
+            for j, i in enumerate(sel):
+                idx = rngs[i].integers(0, n[i], size=(b, n[i])) + desplazamiento
+                conteos[j, :b] = np.bincount(idx.ravel(), minlength=b * ancho_sel).reshape(b, ancho_sel)
+            r_boot[:, inicio:inicio + b] = _weighted_pearson(conteos[:, :b], momentos_sel, n_sel)
+
+        alfa = (1 - confianza) / 2
+        with warnings.catch_warnings():
+            # Grupos sin dispersión en ningún remuestreo producen slices todo-NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            ic_inf[sel], ic_sup[sel] = np.nanpercentile(r_boot, [100 * alfa, 100 * (1 - alfa)], axis=1)
+
+    return {
+        'n': n,
+        'correlacion': r,
+        'p_valor': p_valor,
+        'ic_inf': ic_inf,
+        'ic_sup': ic_sup
+    }
+
+
 class DataProcessor:
     def __init__(self):
         """Inicializar con los datos del reporte"""
@@ -66,24 +182,71 @@ class DataProcessor:
         
         return pd.DataFrame(all_data)
     
-    def calculate_kpis(self, selected_day='all'):
-        """Calcular KPIs principales"""
+    def calculate_kpis(self, selected_day='all', estadisticas=False):
+        """Calcular KPIs principales (con significancia si estadisticas=True)"""
         df = self.data if selected_day == 'all' else self.data[self.data['dia'] == selected_day]
         
         if df.empty:
-            return {
+            kpis = {
                 'correlacion': 0,
                 'uso_promedio': 0,
                 'productividad_promedio': 0,
                 'casos_totales': 0
             }
+        else:
+            kpis = {
+                'correlacion': df['uso_ext'].corr(df['productividad']),
+                'uso_promedio': df['uso_ext'].mean(),
+                'productividad_promedio': df['productividad'].mean(),
+                'casos_totales': int(df['casos'].sum())
+            }
         
-        return {
-            'correlacion': df['uso_ext'].corr(df['productividad']),
-            'uso_promedio': df['uso_ext'].mean(),
-            'productividad_promedio': df['productividad'].mean(),
-            'casos_totales': int(df['casos'].sum())
-        }
+        if estadisticas:
+            kpis['estadisticas'] = self.calculate_correlation_stats(selected_day)
+        
+        return kpis
+    
+    def calculate_correlation_stats(self, selected_day='all', n_bootstrap=2000, seed=42):
+        """Significancia de la correlación uso-productividad: global, por día y por rep"""
+        df = self.data if selected_day == 'all' else self.data[self.data['dia'] == selected_day]
+        
+        vacio = {'n': 0, 'correlacion': np.nan, 'p_valor': np.nan, 'ic_inf': np.nan, 'ic_sup': np.nan}
+        if df.empty:
+            return {'global': vacio, 'por_dia': {}, 'por_rep': {}}
+        
+        por_dia = self._correlation_stats_by_group(df, 'dia', n_bootstrap, seed)
+        por_rep = self._correlation_stats_by_group(df, 'rep', n_bootstrap, seed)
+        
+        # Con un solo día, el global es ese mismo grupo (mismo generador y mismo IC)
+        if selected_day != 'all':
+            global_stats = por_dia[selected_day]
+        else:
+            lote = _correlation_stats(
+                [df['uso_ext'].to_numpy(dtype=float)],
+                [df['productividad'].to_numpy(dtype=float)],
+                n_bootstrap, [_group_rng(seed, 'global', 'all')]
+            )
+            global_stats = {k: v[0].item() for k, v in lote.items()}
+        
+        # Muchas pruebas por rep: p-valores corregidos por Holm
+        p_ajustados = _holm_adjust([res['p_valor'] for res in por_rep.values()])
+        for res, p_ajustado in zip(por_rep.values(), p_ajustados):
+            res['p_ajustado'] = p_ajustado.item()
+        
+        return {'global': global_stats, 'por_dia': por_dia, 'por_rep': por_rep}
+    
+    def _correlation_stats_by_group(self, df, group_col, n_bootstrap, seed):
+        """Estadísticas por grupo, evaluando todos los grupos en un solo lote"""
+        grupos = dict(tuple(df.groupby(group_col, sort=False)))
+        claves = list(grupos)
+        
+        lote = _correlation_stats(
+            [grupos[c]['uso_ext'].to_numpy(dtype=float) for c in claves],
+            [grupos[c]['productividad'].to_numpy(dtype=float) for c in claves],
+            n_bootstrap,
+            [_group_rng(seed, group_col, c) for c in claves]
+        )
+        return {clave: {k: v[i].item() for k, v in lote.items()} for i, clave in enumerate(claves)}
     
     def create_scatter_plot(self, selected_day='all'):
         """Crear scatter plot Uso vs Productividad"""
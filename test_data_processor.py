@@ -0,0 +1,125 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from data_processor import DataProcessor, BOOTSTRAP_MIN_N, _correlation_stats, _group_rng, _holm_adjust
+
+
+def synthetic_processor(n_reps=20, dias=(6, 12), seed=0):
+    rng = np.random.default_rng(seed)
+    n_dias = rng.integers(dias[0], dias[1] + 1, n_reps)
+    rep = np.repeat([f'r{i}' for i in range(n_reps)], n_dias)
+    processor = DataProcessor()
+    processor.data = pd.DataFrame({
+        'rep': rep,
+        'dia': np.concatenate([[f'd{j}' for j in range(n)] for n in n_dias]),
+        'uso_ext': rng.uniform(0, 100, len(rep)),
+        'productividad': rng.uniform(1, 8, len(rep)),
+        'casos': 1
+    })
+    return processor
+
+
+def test_global_matches_scipy_pearsonr():
+    processor = DataProcessor()
+    resultado = processor.calculate_correlation_stats(n_bootstrap=200)['global']
+    esperado = stats.pearsonr(processor.data['uso_ext'], processor.data['productividad'])
+
+    assert resultado['n'] == len(processor.data)
+    assert resultado['correlacion'] == pytest.approx(esperado.statistic)
+    assert resultado['p_valor'] == pytest.approx(esperado.pvalue)
+    assert resultado['correlacion'] == pytest.approx(0.3208, abs=1e-4)
+    assert resultado['p_valor'] == pytest.approx(0.0687, abs=1e-4)
+    assert resultado['ic_inf'] <= resultado['correlacion'] <= resultado['ic_sup']
+
+
+def test_insufficient_n_and_zero_variance_give_nan():
+    rngs = [_group_rng(42, 't', i) for i in range(3)]
+    resultado = _correlation_stats(
+        [np.array([1.0, 2.0]), np.array([3.0, 5.0]), np.array([1.0, 2.0, 4.0])],
+        [np.array([2.0, 4.0]), np.array([1.0, 0.0]), np.array([1.0, 3.0, 2.0])],
+        100, rngs
+    )
+    assert np.isnan(resultado['p_valor'][:2]).all()
+    assert not np.isnan(resultado['p_valor'][2])
+    assert np.isnan(resultado['ic_inf']).all()
+
+    # 3.3 no es representable: la media no coincide exactamente con los valores
+    x = np.arange(10.0, 80.0, 10.0)
+    resultado = _correlation_stats(
+        [x, x], [np.full(x.size, 3.3), x ** 2], 100, [_group_rng(42, 't', i) for i in range(2)]
+    )
+    assert np.isnan(resultado['correlacion'][0])
+    assert np.isnan(resultado['p_valor'][0])
+    assert np.isnan(resultado['ic_inf'][0]) and np.isnan(resultado['ic_sup'][0])
+    assert not np.isnan(resultado['ic_inf'][1])
+
+
+def test_bootstrap_resamples_without_spread_are_excluded():
+    # Sólo dos valores de productividad distintos: algunos remuestreos los repiten
+    x = np.arange(1.0, BOOTSTRAP_MIN_N + 1)
+    y = np.full(BOOTSTRAP_MIN_N, 3.3)
+    y[-1] = 5.2
+    resultado = _correlation_stats([x], [y], 2000, [_group_rng(42, 't', 0)])
+    assert -1.0 <= resultado['ic_inf'][0] <= resultado['ic_sup'][0] <= 1.0
+    assert resultado['ic_inf'][0] > 0
+
+
+def test_bootstrap_requires_minimum_n():
+    processor = DataProcessor()
+    por_rep = processor.calculate_correlation_stats(n_bootstrap=200)['por_rep']
+
+    # Los reps tienen a lo sumo 4 días: hay p-valor pero no IC bootstrap
+    assert not np.isnan(por_rep['tarango']['p_valor'])
+    assert np.isnan(por_rep['tarango']['ic_inf'])
+    assert np.isnan(por_rep['bsarmiento']['p_valor'])
+
+
+def test_day_ci_independent_of_filter():
+    processor = DataProcessor()
+    todos = processor.calculate_correlation_stats('all', n_bootstrap=500)
+    un_dia = processor.calculate_correlation_stats('21/11/2025', n_bootstrap=500)
+
+    assert un_dia['por_dia']['21/11/2025'] == todos['por_dia']['21/11/2025']
+    assert un_dia['global'] == todos['por_dia']['21/11/2025']
+
+
+def test_rep_ci_independent_of_other_reps():
+    processor = synthetic_processor()
+    completo = processor.calculate_correlation_stats(n_bootstrap=500)['por_rep']['r5']
+
+    processor.data = processor.data[processor.data['rep'] != 'r0']
+    sin_r0 = processor.calculate_correlation_stats(n_bootstrap=500)['por_rep']['r5']
+
+    assert not np.isnan(completo['ic_inf'])
+    for clave in ('n', 'correlacion', 'p_valor', 'ic_inf', 'ic_sup'):
+        assert sin_r0[clave] == completo[clave]
+
+
+def test_holm_adjust():
+    ajustados = _holm_adjust([0.01, np.nan, 0.04, 0.03])
+    np.testing.assert_allclose(ajustados, [0.03, np.nan, 0.06, 0.06])
+
+
+def test_calculate_kpis_statistics_mode():
+    processor = DataProcessor()
+    assert 'estadisticas' not in processor.calculate_kpis('all')
+
+    kpis = processor.calculate_kpis('all', estadisticas=True)
+    assert kpis['estadisticas']['global']['correlacion'] == pytest.approx(kpis['correlacion'])
+    assert set(kpis['estadisticas']['por_dia']) == set(processor.days)
+
+
+def test_hundreds_of_reps_within_latency_budget():
+    processor = synthetic_processor(n_reps=500, dias=(6, 40), seed=1)
+
+    inicio = time.perf_counter()
+    por_rep = processor.calculate_correlation_stats()['por_rep']
+    transcurrido = time.perf_counter() - inicio
+
+    assert len(por_rep) == 500
+    assert not any(np.isnan(res['ic_inf']) for res in por_rep.values())
+    assert transcurrido < 5.0